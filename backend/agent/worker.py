@@ -11,21 +11,27 @@ Performance optimizations:
 """
 
 import asyncio
-import json
+import datetime
 import logging
 import os
+import re
 import ssl
 import time
-from typing import Optional
+from collections import OrderedDict
+from typing import Any, Callable, Optional
 
 import aiohttp
 import numpy as np
+import orjson
+from aiohttp import WSMsgType
 from livekit import rtc
 from livekit.agents import (
     Agent,
     AgentSession,
     AutoSubscribe,
     JobContext,
+    JobProcess,
+    RoomInputOptions,
     WorkerOptions,
     cli,
     stt,
@@ -45,6 +51,72 @@ for lib in ["httpx", "httpcore", "aiohttp", "websockets", "asyncio"]:
 # Enable DEBUG for livekit.agents to see session activity
 logging.getLogger("livekit.agents").setLevel(logging.DEBUG)
 
+# uvloop speeds up the websocket/HTTP-heavy STT and TTS paths. Set at import
+# so job processes (which import this module) get it too, not just __main__.
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    logger.debug("uvloop not installed - using default asyncio event loop")
+
+
+def _create_noverify_ssl_context() -> ssl.SSLContext:
+    """TLS context for on-prem services with self-signed certs (no verification).
+
+    Verification is off, so the system CA bundle is never loaded; the context is
+    built once at import and shared by every connection in the process.
+    """
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    ctx.options |= ssl.OP_NO_COMPRESSION
+    # Keep session tickets on so reconnects can resume instead of full handshakes
+    ctx.options &= ~ssl.OP_NO_TICKET
+    return ctx
+
+
+_SSL_CTX_NOVERIFY = _create_noverify_ssl_context()
+
+
+def _make_resolver() -> Optional[aiohttp.AsyncResolver]:
+    """Non-blocking DNS resolver (aiodns) if available, else aiohttp's threaded default."""
+    try:
+        return aiohttp.AsyncResolver()
+    except RuntimeError:
+        return None
+
+
+# =============================================================================
+# HTTP Session - one connector for STT and TTS, owned by each job
+# =============================================================================
+
+def _orjson_str(obj: Any) -> str:
+    # aiohttp's json_serialize must return str; orjson yields UTF-8 bytes
+    return orjson.dumps(obj).decode()
+
+
+def create_http_session() -> aiohttp.ClientSession:
+    """Create the aiohttp session a job's STT and TTS share.
+
+    A single connector means one keep-alive pool and one DNS cache for the
+    small, fixed set of on-prem endpoints. Per-request timeouts are set by
+    callers; the WhisperLiveKit websocket must not inherit a total timeout.
+    The job that creates the session closes it on shutdown, so it never
+    outlives (or is closed under) another job in the same process.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=20,
+        limit_per_host=10,
+        keepalive_timeout=60,
+        ttl_dns_cache=300,
+        enable_cleanup_closed=True,
+        resolver=_make_resolver(),
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        json_serialize=_orjson_str,  # any json= request encodes in C
+    )
+
 
 # =============================================================================
 # Performance Metrics Tracker
@@ -53,6 +125,20 @@ logging.getLogger("livekit.agents").setLevel(logging.DEBUG)
 class PerfMetrics:
     """Track per-component latencies for the voice pipeline."""
 
+    __slots__ = (
+        "speech_start",
+        "speech_end",
+        "stt_start",
+        "stt_end",
+        "llm_start",
+        "llm_first_token",
+        "llm_end",
+        "tts_start",
+        "tts_first_chunk",
+        "tts_end",
+        "tts_cached",
+    )
+
     def __init__(self):
         self.reset()
 
@@ -67,6 +153,7 @@ class PerfMetrics:
         self.tts_start: Optional[float] = None
         self.tts_first_chunk: Optional[float] = None
         self.tts_end: Optional[float] = None
+        self.tts_cached = False  # Audio served from PiperTTS's phrase cache
 
     def log_summary(self, turn_id: str = ""):
         """Log performance summary for this turn."""
@@ -87,15 +174,26 @@ class PerfMetrics:
         if self.speech_end and self.tts_first_chunk:
             metrics["e2e_ms"] = int((self.tts_first_chunk - self.speech_end) * 1000)
 
+        if self.tts_cached:
+            metrics["tts_cached"] = True
+
         if metrics:
-            logger.info(f"[PERF] {turn_id} | STT:{metrics.get('stt_ms', '?')}ms | LLM-TTFT:{metrics.get('llm_ttft_ms', '?')}ms | LLM:{metrics.get('llm_total_ms', '?')}ms | TTS-TTFB:{metrics.get('tts_ttfb_ms', '?')}ms | E2E:{metrics.get('e2e_ms', '?')}ms")
+            tts_ttfb = "cached" if self.tts_cached else f"{metrics.get('tts_ttfb_ms', '?')}ms"
+            logger.info(f"[PERF] {turn_id} | STT:{metrics.get('stt_ms', '?')}ms | LLM-TTFT:{metrics.get('llm_ttft_ms', '?')}ms | LLM:{metrics.get('llm_total_ms', '?')}ms | TTS-TTFB:{tts_ttfb} | E2E:{metrics.get('e2e_ms', '?')}ms")
 
         return metrics
 
+    def end_turn(self, turn_id: str = ""):
+        """Log the turn summary and clear timestamps for the next turn."""
+        self.log_summary(turn_id)
+        self.reset()
+
 
 # Global metrics instance
 perf = PerfMetrics()
 
+_UTC = datetime.timezone.utc
+
 
 # =============================================================================
 # WhisperLiveKit STT - Production Implementation with Metrics
@@ -111,14 +209,27 @@ class WhisperLiveKitSTT(stt.STT):
     - Extract detected language for multi-language TTS
     """
 
-    def __init__(self, host: str, port: int, use_ssl: bool = True):
+    # Max time the first stream waits for an in-flight pre-open
+    PREWARM_WAIT = 1.0
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        http_session: aiohttp.ClientSession,
+        use_ssl: bool = True,
+    ):
         super().__init__(
             capabilities=stt.STTCapabilities(streaming=True, interim_results=True)
         )
+        self._http_session = http_session
         self._host = host
         self._port = port
         self._use_ssl = use_ssl
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._ssl_ctx = _SSL_CTX_NOVERIFY if use_ssl else None
+        # WhisperLiveKit uses /asr endpoint for WebSocket ASR
+        self._ws_url = f"{'wss' if use_ssl else 'ws'}://{host}:{port}/asr"
+        self._prewarm_task: Optional[asyncio.Task] = None  # Pre-opened first websocket
         self._detected_language = "en"  # Track detected language
         logger.info(f"[STT] WhisperLiveKit configured: {'wss' if use_ssl else 'ws'}://{host}:{port}")
 
@@ -128,24 +239,92 @@ class WhisperLiveKitSTT(stt.STT):
         return self._detected_language
 
     def _get_session(self) -> aiohttp.ClientSession:
-        if self._session is None or self._session.closed:
-            # Use persistent connection with keep-alive
-            connector = aiohttp.TCPConnector(limit=10, keepalive_timeout=30)
-            self._session = aiohttp.ClientSession(connector=connector)
-        return self._session
+        # Persistent keep-alive connections, shared with TTS
+        return self._http_session
+
+    async def _connect_ws(self) -> aiohttp.ClientWebSocketResponse:
+        return await asyncio.wait_for(
+            self._get_session().ws_connect(
+                self._ws_url,
+                ssl=self._ssl_ctx,
+                heartbeat=30,
+                receive_timeout=None  # No timeout - server controls lifecycle
+            ),
+            timeout=10,
+        )
+
+    def prewarm(self):
+        """Start opening the first /asr websocket so turn one skips the handshake.
+
+        Runs in the background; the first stream picks the socket up. The
+        server's config message stays buffered until the stream reads it.
+        """
+        self._prewarm_task = asyncio.ensure_future(self._open_prewarmed_ws())
+
+    async def _open_prewarmed_ws(self) -> Optional[aiohttp.ClientWebSocketResponse]:
+        start = time.perf_counter()
+        try:
+            ws = await self._connect_ws()
+        except Exception as e:
+            logger.warning(f"[STT] Pre-warm failed: {e}")
+            return None
+        logger.info(f"[STT] WebSocket pre-warmed in {(time.perf_counter() - start) * 1000:.0f}ms")
+        return ws
+
+    async def _take_prewarmed_ws(self) -> Optional[aiohttp.ClientWebSocketResponse]:
+        """Hand the pre-warmed websocket to one stream, if it is open.
+
+        An in-flight pre-open is awaited for at most PREWARM_WAIT, then
+        cancelled so the stream connects on its own.
+        """
+        task, self._prewarm_task = self._prewarm_task, None
+        if task is None:
+            return None
+        try:
+            ws = await asyncio.wait_for(task, timeout=self.PREWARM_WAIT)
+        except asyncio.TimeoutError:
+            logger.warning("[STT] Pre-warmed websocket not ready - connecting directly")
+            return None
+        if ws is None or ws.closed:
+            return None
+        return ws
+
+    async def close_prewarmed(self):
+        """Cancel or close a pre-warmed websocket no stream claimed (job shutdown)."""
+        task, self._prewarm_task = self._prewarm_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            ws = await task
+        except asyncio.CancelledError:
+            return
+        if ws is not None and not ws.closed:
+            await ws.close()
 
     async def _recognize_impl(self, buffer, *, language=None, conn_options=None):
         """Non-streaming recognition - not typically used with streaming STT."""
         raise NotImplementedError("Use stream() for WhisperLiveKit")
 
     def stream(self, *, language=None, conn_options=None) -> "WhisperLiveKitStream":
-        return WhisperLiveKitStream(
-            host=self._host,
-            port=self._port,
-            use_ssl=self._use_ssl,
-            session=self._get_session(),
-            conn_options=conn_options,
-        )
+        return WhisperLiveKitStream(stt_parent=self, conn_options=conn_options)
+
+
+# WhisperLiveKit control messages lead with their type; matched on the first
+# bytes so they can be handled without a full JSON parse
+_CONTROL_MSG_RE = re.compile(r'"type"\s*:\s*"(config|ready_to_stop)"')
+
+
+def _dict_line_text(line: dict) -> str:
+    return line.get("text", "").strip()
+
+
+def _str_line_text(line) -> str:
+    return str(line).strip()
+
+
+class _WebSocketClosed(Exception):
+    """The WhisperLiveKit websocket closed; used to stop the sibling send/recv task."""
 
 
 class WhisperLiveKitStream(stt.RecognizeStream):
@@ -164,102 +343,114 @@ class WhisperLiveKitStream(stt.RecognizeStream):
 
     # REMOVED: STABLE_TIMEOUT forced premature finalization, bypassing turn detector
 
+    # Stable-interim window before the one-shot language-setting final
+    LANGUAGE_FINAL_TIMEOUT = 0.15
+
+    # Audio is sent in ~100ms websocket messages (16kHz mono int16), but a
+    # batch is never held longer than SEND_MAX_DELAY to bound added latency
+    SEND_BATCH_BYTES = 3200
+    SEND_MAX_DELAY = 0.06
+
+    # WhisperLiveKit sends several partials per 100ms; downstream only needs the
+    # latest, so interims go out at most this often (the newest is always sent)
+    INTERIM_MIN_INTERVAL = 0.08
+
+    # Failed emits (e.g. closed channel) repeat per message; limit tracebacks
+    EMIT_ERROR_TRACEBACK_EVERY = 100
+
+    # Bound once at class scope - looked up on every emitted event
+    _FINAL = stt.SpeechEventType.FINAL_TRANSCRIPT
+    _INTERIM = stt.SpeechEventType.INTERIM_TRANSCRIPT
+
     def __init__(
         self,
-        host: str,
-        port: int,
-        use_ssl: bool,
-        session: aiohttp.ClientSession,
+        stt_parent: WhisperLiveKitSTT,
         conn_options
     ):
         super().__init__(
-            stt=WhisperLiveKitSTT(host, port, use_ssl),
+            stt=stt_parent,
             conn_options=conn_options,
             sample_rate=16000
         )
-        self._host = host
-        self._port = port
-        self._use_ssl = use_ssl
-        self._session = session
+        self._stt_parent = stt_parent
         self._last_interim = ""  # Last interim text (for deduplication)
-        self._last_interim_time = 0.0  # For language-setting final
+        self._language_timer: Optional[asyncio.TimerHandle] = None  # Pending language-setting final
         self._language_final_emitted = False  # Track if we've set language
         self._processed_lines = 0  # Count of lines already emitted as final
+        self._line_text: Optional[Callable[[Any], str]] = None  # Resolved on first lines[] payload
         self._first_audio_time: Optional[float] = None
+        self._emit_errors = 0
+        self._last_interim_emit = 0.0  # perf_counter of last interim actually sent
+        self._interim_timer: Optional[asyncio.TimerHandle] = None  # Trailing interim send
         # Extract language from conn_options or default to empty string
         self._detected_language = conn_options.language if conn_options and hasattr(conn_options, 'language') else ""
 
     async def _run(self):
         """Main streaming loop - receives audio from input channel, sends to WhisperLiveKit."""
-        protocol = "wss" if self._use_ssl else "ws"
-        # WhisperLiveKit uses /asr endpoint for WebSocket ASR
-        url = f"{protocol}://{self._host}:{self._port}/asr"
-
-        ssl_ctx = None
-        if self._use_ssl:
-            ssl_ctx = ssl.create_default_context()
-            ssl_ctx.check_hostname = False
-            ssl_ctx.verify_mode = ssl.CERT_NONE
-
-        closing = False
-        connect_start = time.time()
+        connect_start = time.perf_counter()
 
         async def send_audio(ws):
             """Send audio frames to WhisperLiveKit.
 
-            Per official protocol: send raw PCM bytes directly.
+            Per official protocol: send raw PCM bytes directly. Incoming frames
+            (already 16kHz mono int16) are coalesced into ~100ms messages to cut
+            per-message websocket overhead.
+
+            Returns normally when the input ends so the server's trailing
+            transcripts are still received; raises _WebSocketClosed if the
+            socket can no longer be written, which cancels recv_transcripts.
             """
-            nonlocal closing
-            # Buffer for converting to consistent chunk sizes
-            buffer = utils.audio.AudioByteStream(
-                sample_rate=16000,
-                num_channels=1,
-                samples_per_channel=400  # 25ms chunks
-            )
+            batch = bytearray()
+            batch_started = 0.0
+
+            async def send_batch():
+                """Send the pending batch, handing the filled buffer off uncopied."""
+                nonlocal batch
+                payload, batch = batch, bytearray()
+                try:
+                    await ws.send_bytes(payload)
+                except ConnectionResetError:
+                    logger.warning("[STT] Connection reset - stopping send")
+                    raise _WebSocketClosed()
+                except Exception as e:
+                    if "closing" in str(e).lower() or "closed" in str(e).lower():
+                        logger.debug("[STT] WebSocket closing - stopping send")
+                    else:
+                        logger.error(f"[STT] Send error: {e}")
+                    raise _WebSocketClosed() from e
 
             async for data in self._input_ch:
-                if closing or ws.closed:
-                    break
+                if ws.closed:
+                    raise _WebSocketClosed()
 
                 if isinstance(data, rtc.AudioFrame):
+                    now = time.perf_counter()
                     if self._first_audio_time is None:
-                        self._first_audio_time = time.time()
-                        perf.stt_start = self._first_audio_time
+                        self._first_audio_time = now
+                        perf.stt_start = now
                         logger.debug("[STT] First audio frame received")
 
-                    for frame in buffer.write(data.data.tobytes()):
-                        if closing or ws.closed:
-                            break
-                        try:
-                            await ws.send_bytes(frame.data.tobytes())
-                        except ConnectionResetError:
-                            logger.warning("[STT] Connection reset - stopping send")
-                            closing = True
-                            return
-                        except Exception as e:
-                            if "closing" in str(e).lower() or "closed" in str(e).lower():
-                                logger.debug("[STT] WebSocket closing - stopping send")
-                                closing = True
-                                return
-                            logger.error(f"[STT] Send error: {e}")
-                            return
+                    if not batch:
+                        batch_started = now
+                    # Copy the frame's buffer straight into the batch - no intermediate bytes
+                    batch += memoryview(data.data).cast("B")
+
+                    if (
+                        len(batch) >= self.SEND_BATCH_BYTES
+                        or now - batch_started >= self.SEND_MAX_DELAY
+                    ):
+                        await send_batch()
 
                 elif isinstance(data, self._FlushSentinel):
                     # Flush remaining audio and signal end
-                    for frame in buffer.flush():
-                        if ws.closed:
-                            break
-                        try:
-                            await ws.send_bytes(frame.data.tobytes())
-                        except Exception:
-                            pass
+                    if batch and not ws.closed:
+                        await send_batch()
                     # Per protocol: send empty blob to signal end
                     try:
                         if not ws.closed:
                             await ws.send_bytes(b"")
                     except Exception:
                         pass
-            closing = True
 
         async def recv_transcripts(ws):
             """Receive and process transcripts from WhisperLiveKit in real-time.
@@ -267,62 +458,52 @@ class WhisperLiveKitStream(stt.RecognizeStream):
             WhisperLiveKit streams interim transcripts via buffer_transcription.
             Finals are emitted when 'lines' array grows or when stream closes.
 
-            IMPORTANT: We emit a "quick final" after 300ms of stable text to set
+            IMPORTANT: We emit a "quick final" after 150ms of stable text to set
             the language in the SDK. Without this, the turn detector won't work
-            because it requires language from a FINAL_TRANSCRIPT.
-            """
-            nonlocal closing
-
-            # Background task to emit language-setting final
-            async def check_language_final():
-                """Emit a quick final to set language after short stable period.
-
-                Per LiveKit docs, the turn detector requires language from FINAL_TRANSCRIPT.
-                We emit a quick final after 150ms of stable text to set the language.
-                """
-                while not closing:
-                    await asyncio.sleep(0.05)  # Check every 50ms for responsiveness
-                    if (
-                        not self._language_final_emitted
-                        and self._last_interim
-                        and self._last_interim_time > 0
-                        and time.time() - self._last_interim_time >= 0.15  # 150ms stable
-                    ):
-                        self._language_final_emitted = True
-                        logger.info(f"[STT] Language-setting final: '{self._last_interim}'")
-                        self._emit_final(self._last_interim, is_language_setting=True)
+            because it requires language from a FINAL_TRANSCRIPT. The timer is
+            armed by _emit_interim, so nothing polls while the user is silent.
 
-            language_task = asyncio.create_task(check_language_final())
+            Ends on ready_to_stop (server drained all audio) or when the server
+            closes the socket; the latter raises _WebSocketClosed to stop send_audio.
+            """
+            last_raw = None
 
             try:
-                while True:
-                    try:
-                        msg = await ws.receive()
-                    except Exception as e:
-                        if closing:
+                # aiohttp's async iterator stops on CLOSE/CLOSING/CLOSED
+                async for msg in ws:
+                    if msg.type != WSMsgType.TEXT:
+                        if msg.type == WSMsgType.ERROR:
+                            logger.error(f"[STT] Receive error: {ws.exception()}")
                             break
-                        logger.error(f"[STT] Receive error: {e}")
-                        break
+                        continue
 
-                    if msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.CLOSE):
-                        break
+                    # WhisperLiveKit re-sends its full state on every update; an
+                    # identical payload cannot yield a new transcript, so skip parsing
+                    if msg.data == last_raw:
+                        continue
+                    last_raw = msg.data
 
-                    if msg.type != aiohttp.WSMsgType.TEXT:
+                    control = _CONTROL_MSG_RE.search(msg.data, 0, 64)
+                    if control is not None:
+                        if control.group(1) == "ready_to_stop":
+                            logger.debug("[STT] Ready to stop received")
+                            return
+                        logger.debug("[STT] Config received")
                         continue
 
                     try:
-                        data = json.loads(msg.data)
-                    except json.JSONDecodeError:
+                        data = orjson.loads(msg.data)
+                    except orjson.JSONDecodeError:
                         continue
 
-                    # Handle protocol messages
+                    # Handle protocol messages not caught by the fast path
                     msg_type = data.get("type", "transcription")
                     if msg_type == "config":
-                        logger.debug(f"[STT] Config received: useAudioWorklet={data.get('useAudioWorklet')}")
+                        logger.debug("[STT] Config received: useAudioWorklet=%s", data.get('useAudioWorklet'))
                         continue
                     elif msg_type == "ready_to_stop":
                         logger.debug("[STT] Ready to stop received")
-                        continue
+                        return
 
                     text, is_final = self._extract_text(data)
                     if not text:
@@ -333,57 +514,51 @@ class WhisperLiveKitStream(stt.RecognizeStream):
                     else:
                         self._emit_interim(text)
 
-            except asyncio.CancelledError:
-                pass
+                raise _WebSocketClosed()
             finally:
-                language_task.cancel()
-                try:
-                    await language_task
-                except asyncio.CancelledError:
-                    pass
+                self._cancel_language_timer()
+                self._flush_pending_interim()
                 # Emit final with any remaining interim text when stream closes
                 if self._last_interim:
-                    logger.debug(f"[STT] Final on stream close: '{self._last_interim[:40]}...'")
+                    logger.debug("[STT] Final on stream close: '%.40s...'", self._last_interim)
                     self._emit_final(self._last_interim)
 
         # Connect and run
         try:
-            ws = await asyncio.wait_for(
-                self._session.ws_connect(
-                    url,
-                    ssl=ssl_ctx,
-                    heartbeat=30,
-                    receive_timeout=None  # No timeout - server controls lifecycle
-                ),
-                timeout=10,
-            )
-            connect_time = (time.time() - connect_start) * 1000
-            logger.info(f"[STT] Connected to WhisperLiveKit in {connect_time:.0f}ms")
-
-            # Per official WhisperLiveKit protocol (github.com/QuentinFuxa/WhisperLiveKit):
-            # 1. Server sends {type: "config", useAudioWorklet: true/false} first
-            # 2. Client waits for config, then sends raw audio bytes
-            # 3. Do NOT send config from client - server doesn't expect it
-            try:
-                config_msg = await asyncio.wait_for(ws.receive(), timeout=5.0)
-                if config_msg.type == aiohttp.WSMsgType.TEXT:
-                    config_data = json.loads(config_msg.data)
-                    if config_data.get("type") == "config":
-                        use_worklet = config_data.get("useAudioWorklet", False)
-                        logger.info(f"[STT] Server config received: useAudioWorklet={use_worklet}")
+            ws = await self._stt_parent._take_prewarmed_ws()
+            if ws is not None:
+                logger.info("[STT] Using pre-warmed WhisperLiveKit connection")
+            else:
+                ws = await self._stt_parent._connect_ws()
+                connect_time = (time.perf_counter() - connect_start) * 1000
+                logger.info(f"[STT] Connected to WhisperLiveKit in {connect_time:.0f}ms")
+
+            async with ws:
+                # Per official WhisperLiveKit protocol (github.com/QuentinFuxa/WhisperLiveKit):
+                # 1. Server sends {type: "config", useAudioWorklet: true/false} first
+                # 2. Client waits for config, then sends raw audio bytes
+                # 3. Do NOT send config from client - server doesn't expect it
+                try:
+                    config_msg = await asyncio.wait_for(ws.receive(), timeout=5.0)
+                    if config_msg.type == WSMsgType.TEXT:
+                        config_data = orjson.loads(config_msg.data)
+                        if config_data.get("type") == "config":
+                            use_worklet = config_data.get("useAudioWorklet", False)
+                            logger.info(f"[STT] Server config received: useAudioWorklet={use_worklet}")
+                        else:
+                            logger.debug("[STT] First message (non-config): %s", config_data)
                     else:
-                        logger.debug(f"[STT] First message (non-config): {config_data}")
-                else:
-                    logger.debug(f"[STT] First message type: {config_msg.type}")
-            except asyncio.TimeoutError:
-                logger.warning("[STT] No config from server in 5s - proceeding anyway")
-
-            # Run send and receive concurrently
-            await asyncio.gather(
-                send_audio(ws),
-                recv_transcripts(ws),
-                return_exceptions=True
-            )
+                        logger.debug("[STT] First message type: %s", config_msg.type)
+                except asyncio.TimeoutError:
+                    logger.warning("[STT] No config from server in 5s - proceeding anyway")
+
+                # Run send and receive together; a failure in either cancels the other
+                try:
+                    async with asyncio.TaskGroup() as tg:
+                        tg.create_task(send_audio(ws))
+                        tg.create_task(recv_transcripts(ws))
+                except* _WebSocketClosed:
+                    logger.debug("[STT] WebSocket closed - stream ended")
 
         except asyncio.TimeoutError:
             logger.error("[STT] Connection timeout")
@@ -398,31 +573,33 @@ class WhisperLiveKitStream(stt.RecognizeStream):
         - buffer_transcription: pending unvalidated text (NOT cumulative)
         - language: detected language code (e.g., "en", "hi", "kn", "mr")
 
+        Control messages (config, ready_to_stop) are filtered by the caller.
+
         Returns: (text, is_final)
         """
-        msg_type = data.get("type", "")
-        if msg_type in ("config", "ready_to_stop"):
-            return "", False
-
         # Extract detected language if available
         # WhisperLiveKit may send language as "language" or "detected_language"
         detected_lang = data.get("language") or data.get("detected_language")
         if detected_lang and detected_lang != self._detected_language:
             self._detected_language = detected_lang
-            logger.info(f"[STT] Detected language: {detected_lang}")
+            logger.info("[STT] Detected language: %s", detected_lang)
 
         # Process new finalized lines
         lines = data.get("lines", [])
         if len(lines) > self._processed_lines:
+            # Line shape (dict vs plain string) is fixed per server; resolve it once
+            line_text = self._line_text
+            if line_text is None:
+                line_text = self._line_text = (
+                    _dict_line_text if isinstance(lines[0], dict) else _str_line_text
+                )
             # Collect all new finalized text
-            new_texts = []
-            for line in lines[self._processed_lines:]:
-                text = line.get("text", "").strip() if isinstance(line, dict) else str(line).strip()
-                if text:
-                    new_texts.append(text)
+            text = " ".join(
+                t for t in map(line_text, lines[self._processed_lines:]) if t
+            )
             self._processed_lines = len(lines)
-            if new_texts:
-                return " ".join(new_texts), True
+            if text:
+                return text, True
 
         # buffer_transcription is already just the pending portion
         buffer = data.get("buffer_transcription", "").strip()
@@ -439,31 +616,35 @@ class WhisperLiveKitStream(stt.RecognizeStream):
             is_language_setting: If True, this is a quick final just to set language
         """
         # Record STT completion time
-        perf.stt_end = time.time()
-        perf.speech_end = time.time()
-        stt_latency = int((perf.stt_end - perf.stt_start) * 1000) if perf.stt_start else 0
+        now = time.perf_counter()
+        perf.stt_end = now
+        perf.speech_end = now
+
+        # Deliver a throttled interim before the final that supersedes it
+        self._flush_pending_interim()
 
         try:
             event = stt.SpeechEvent(
-                type=stt.SpeechEventType.FINAL_TRANSCRIPT,
+                type=self._FINAL,
                 alternatives=[stt.SpeechData(language=self._detected_language, text=text)],
             )
-            logger.info(f"[STT-EVENT] Sending FINAL event: '{text}' to event channel")
             self._event_ch.send_nowait(event)
-            logger.info(f"[STT-EVENT] FINAL event sent successfully")
         except Exception as e:
-            logger.error(f"[STT-EVENT] FAILED to emit final event: {e}", exc_info=True)
+            self._log_emit_error("final", e)
 
         # Reset interim tracking after emitting final
         self._last_interim = ""
+        self._cancel_language_timer()
 
         # If this is a real final (from lines[]), reset language flag for next turn
         if not is_language_setting:
             self._language_final_emitted = False
 
-        display_text = f"'{text[:50]}...'" if len(text) > 50 else f"'{text}'"
-        final_type = "lang-set" if is_language_setting else "real"
-        logger.info(f"[STT] Final [{final_type}] ({stt_latency}ms): {display_text}")
+        if logger.isEnabledFor(logging.INFO):
+            stt_latency = int((now - perf.stt_start) * 1000) if perf.stt_start else 0
+            display_text = f"'{text[:50]}...'" if len(text) > 50 else f"'{text}'"
+            final_type = "lang-set" if is_language_setting else "real"
+            logger.info(f"[STT] Final [{final_type}] ({stt_latency}ms): {display_text}")
 
     def _emit_interim(self, text: str):
         """Emit interim transcript event only when text changes, with detected language.
@@ -472,22 +653,85 @@ class WhisperLiveKitStream(stt.RecognizeStream):
         """
         if text != self._last_interim:
             self._last_interim = text
-            self._last_interim_time = time.time()
+            if not self._language_final_emitted:
+                self._arm_language_timer()
+
+            # Throttle: send now if the interval has passed, otherwise let the
+            # trailing timer send whatever interim is latest when it fires
+            if self._interim_timer is not None:
+                return
+            wait = self._last_interim_emit + self.INTERIM_MIN_INTERVAL - time.perf_counter()
+            if wait > 0:
+                self._interim_timer = asyncio.get_running_loop().call_later(
+                    wait, self._on_interim_timeout
+                )
+                return
+            self._send_interim(text)
+
+    def _send_interim(self, text: str):
+        """Push one INTERIM_TRANSCRIPT event downstream."""
+        self._last_interim_emit = time.perf_counter()
 
-            # Log interim for debugging turn detector flow
+        # Log interim for debugging turn detector flow
+        if logger.isEnabledFor(logging.DEBUG):
             display_text = f"'{text[:40]}...'" if len(text) > 40 else f"'{text}'"
             logger.debug(f"[STT] Interim: {display_text}")
 
-            try:
-                event = stt.SpeechEvent(
-                    type=stt.SpeechEventType.INTERIM_TRANSCRIPT,
-                    alternatives=[stt.SpeechData(language=self._detected_language, text=text)],
-                )
-                logger.debug(f"[STT-EVENT] Sending INTERIM event: {display_text}")
-                self._event_ch.send_nowait(event)
-                logger.debug(f"[STT-EVENT] INTERIM event sent")
-            except Exception as e:
-                logger.error(f"[STT-EVENT] FAILED to emit interim event: {e}", exc_info=True)
+        try:
+            event = stt.SpeechEvent(
+                type=self._INTERIM,
+                alternatives=[stt.SpeechData(language=self._detected_language, text=text)],
+            )
+            self._event_ch.send_nowait(event)
+        except Exception as e:
+            self._log_emit_error("interim", e)
+
+    def _on_interim_timeout(self):
+        self._interim_timer = None
+        if self._last_interim:
+            self._send_interim(self._last_interim)
+
+    def _flush_pending_interim(self):
+        """Send the throttled interim now, if one is waiting."""
+        if self._interim_timer is not None:
+            self._interim_timer.cancel()
+            self._on_interim_timeout()
+
+    def _log_emit_error(self, kind: str, e: Exception):
+        """Log a failed event emit; the traceback only once per EMIT_ERROR_TRACEBACK_EVERY."""
+        self._emit_errors += 1
+        logger.error(
+            "[STT-EVENT] FAILED to emit %s event (%d total): %s",
+            kind,
+            self._emit_errors,
+            e,
+            exc_info=self._emit_errors % self.EMIT_ERROR_TRACEBACK_EVERY == 1,
+        )
+
+    def _arm_language_timer(self):
+        """(Re)start the stable-text timer for the language-setting final."""
+        if self._language_timer is not None:
+            self._language_timer.cancel()
+        self._language_timer = asyncio.get_running_loop().call_later(
+            self.LANGUAGE_FINAL_TIMEOUT, self._on_language_timeout
+        )
+
+    def _cancel_language_timer(self):
+        if self._language_timer is not None:
+            self._language_timer.cancel()
+            self._language_timer = None
+
+    def _on_language_timeout(self):
+        """Emit a quick final to set language once interim text has been stable.
+
+        Per LiveKit docs, the turn detector requires language from FINAL_TRANSCRIPT.
+        """
+        self._language_timer = None
+        if self._language_final_emitted or not self._last_interim:
+            return
+        self._language_final_emitted = True
+        logger.info("[STT] Language-setting final: '%s'", self._last_interim)
+        self._emit_final(self._last_interim, is_language_setting=True)
 
 
 # =============================================================================
@@ -512,24 +756,88 @@ class PiperTTS(tts.TTS):
     Automatically selects voice based on detected language from STT.
     """
 
-    def __init__(self, base_url: str, stt_instance: Optional[WhisperLiveKitSTT] = None):
+    # sock_connect caps a single TCP handshake, so a dead Piper host fails fast
+    # instead of waiting out the 5s pool+connect budget
+    REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=5, sock_connect=2)
+    SAMPLE_RATE = 22050
+
+    # Short phrases ("Sure.", "One moment.") repeat across turns; their PCM is
+    # kept in a small LRU so a repeat is one emitter push instead of a request
+    CACHE_MAX_ENTRIES = 64
+    CACHE_MAX_TEXT = 80
+
+    def __init__(
+        self,
+        base_url: str,
+        http_session: aiohttp.ClientSession,
+        stt_instance: Optional[WhisperLiveKitSTT] = None,
+    ):
         super().__init__(
             capabilities=tts.TTSCapabilities(streaming=False),  # Non-streaming synthesis per request
-            sample_rate=22050,
+            sample_rate=self.SAMPLE_RATE,
             num_channels=1,
         )
-        self._url = f"{base_url.rstrip('/')}/api/synthesize/stream"
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._http_session = http_session
+        self._base_url = base_url.rstrip('/')
+        self._url = f"{self._base_url}/api/synthesize/stream"
         self._stt = stt_instance  # Reference to STT for language detection
+        self._cache: OrderedDict[tuple[str, str], bytes] = OrderedDict()  # (voice, text) -> PCM
         logger.info(f"[TTS] Piper configured: {self._url}")
         logger.info(f"[TTS] Multi-language voices: {list(VOICE_MAP.keys())}")
 
     def _get_session(self) -> aiohttp.ClientSession:
-        if self._session is None or self._session.closed:
-            connector = aiohttp.TCPConnector(limit=10, keepalive_timeout=30)
-            timeout = aiohttp.ClientTimeout(total=30, connect=5)
-            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
-        return self._session
+        # Persistent keep-alive connections, shared with STT
+        return self._http_session
+
+    async def prewarm(self):
+        """Open a keep-alive connection so the first synthesis skips DNS/TCP setup."""
+        start = time.perf_counter()
+        try:
+            async with self._get_session().get(
+                f"{self._base_url}/health", timeout=aiohttp.ClientTimeout(total=2)
+            ) as resp:
+                await resp.read()
+            logger.info(f"[TTS] Connection pre-warmed in {(time.perf_counter() - start) * 1000:.0f}ms")
+        except Exception as e:
+            logger.warning(f"[TTS] Pre-warm failed: {e}")
+
+    async def synthesize_pcm(
+        self, text: str, voice: str, timeout: aiohttp.ClientTimeout
+    ) -> Optional[bytes]:
+        """Synthesize text to raw PCM in one request; None on any failure."""
+        start = time.perf_counter()
+        try:
+            async with self._get_session().post(
+                self._url,
+                json={"text": text, "voice": voice, "sample_rate": self.sample_rate},
+                headers={"Accept-Encoding": "identity"},
+                timeout=timeout,
+            ) as resp:
+                if resp.status != 200:
+                    logger.warning("[TTS] Synthesis HTTP %d", resp.status)
+                    return None
+                pcm = await resp.read()
+        except Exception as e:
+            logger.warning("[TTS] Synthesis failed: %r", e)
+            return None
+        logger.info("[TTS] Synthesized %d bytes in %.0fms", len(pcm), (time.perf_counter() - start) * 1000)
+        return pcm or None
+
+    def _cached_audio(self, voice: str, text: str) -> Optional[bytes]:
+        """Cached PCM for (voice, text), marked most recently used; None on a miss."""
+        pcm = self._cache.get((voice, text))
+        if pcm is not None:
+            self._cache.move_to_end((voice, text))
+        return pcm
+
+    def _cache_audio(self, voice: str, text: str, pcm: bytes):
+        """Store PCM for a short text, evicting the least recently used entry."""
+        if not pcm or len(text) > self.CACHE_MAX_TEXT:
+            return
+        self._cache[(voice, text)] = pcm
+        self._cache.move_to_end((voice, text))
+        if len(self._cache) > self.CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
 
     def synthesize(self, text: str, *, conn_options=None) -> "PiperChunkedStream":
         return PiperChunkedStream(
@@ -547,10 +855,20 @@ class PiperChunkedStream(tts.ChunkedStream):
 
     Performance optimizations:
     - Streaming response for lower time-to-first-byte
-    - Chunk-based processing (4KB = ~90ms of audio)
+    - First chunk pushed as soon as it arrives, later audio in ~400ms blocks
     - Connection reuse
     """
 
+    # Coalesced pushes are whole 20ms frames (882 bytes at 22050Hz mono int16)
+    # so the emitter never has to re-split a partial frame across pushes
+    FRAME_BYTES = PiperTTS.SAMPLE_RATE // 50 * 2
+    PUSH_BYTES = FRAME_BYTES * 20  # ~400ms
+    # Response read buffer (aiohttp default 64KB): fewer pause/resume cycles and
+    # larger iter_any() reads while a long utterance is arriving
+    READ_BUFSIZE = 256 * 1024
+    # Body is pre-encoded with orjson; identity = raw PCM, no decompressor buffering
+    REQUEST_HEADERS = {"Content-Type": "application/json", "Accept-Encoding": "identity"}
+
     def __init__(
         self,
         tts: "PiperTTS",
@@ -586,41 +904,81 @@ class PiperChunkedStream(tts.ChunkedStream):
             detected_lang = self._tts._stt.detected_language
 
         voice = VOICE_MAP.get(detected_lang, DEFAULT_VOICE)
-        logger.info(f"[TTS] Using voice '{voice}' for language '{detected_lang}'")
+        logger.debug("[TTS] Using voice '%s' for language '%s'", voice, detected_lang)
+
+        text = self._input_text  # cache key is exactly the text sent to Piper
+        cached = self._tts._cached_audio(voice, text)
+        if cached is not None:
+            # No synthesis happened: only the first-audio time is real, and
+            # the summary reports TTS as cached rather than a 0ms TTFB
+            perf.tts_cached = True
+            perf.tts_first_chunk = time.perf_counter()
+            logger.debug("[TTS] Cache hit: %d bytes", len(cached))
+            output_emitter.push(cached)
+            asyncio.get_running_loop().call_soon(perf.end_turn, "turn")
+            output_emitter.flush()
+            return
 
-        perf.tts_start = time.time()
-        start = time.time()
+        perf.tts_start = time.perf_counter()
+        start = time.perf_counter()
         first_chunk = True
         total_bytes = 0
+        # Full PCM is only collected for texts short enough to be cached
+        recorded = bytearray() if len(text) <= PiperTTS.CACHE_MAX_TEXT else None
 
         try:
             async with self._session.post(
                 self._url,
-                json={"text": self._input_text, "voice": voice, "sample_rate": self._sample_rate}
+                data=orjson.dumps({"text": text, "voice": voice, "sample_rate": self._sample_rate}),
+                headers=self.REQUEST_HEADERS,
+                timeout=PiperTTS.REQUEST_TIMEOUT,
+                read_bufsize=self.READ_BUFSIZE,
             ) as resp:
                 if resp.status != 200:
                     error_text = await resp.text()
                     logger.error(f"[TTS] HTTP {resp.status}: {error_text}")
+                    output_emitter.flush()  # close the segment opened by initialize()
                     return
 
-                # Stream chunks as they arrive
-                async for chunk in resp.content.iter_chunked(4096):
+                # First chunk is pushed as soon as it arrives (TTFB); the rest is
+                # coalesced into PUSH_BYTES blocks to cut per-push emitter work
+                pending = bytearray()
+                async for chunk in resp.content.iter_any():
+                    total_bytes += len(chunk)
+                    if recorded is not None:
+                        recorded += chunk
                     if first_chunk:
-                        perf.tts_first_chunk = time.time()
+                        perf.tts_first_chunk = time.perf_counter()
                         ttfb = int((perf.tts_first_chunk - start) * 1000)
-                        logger.info(f"[TTS] First chunk: {ttfb}ms")
+                        logger.info("[TTS] First chunk: %dms", ttfb)
                         first_chunk = False
+                        output_emitter.push(chunk)
+                        continue
 
-                    total_bytes += len(chunk)
-                    output_emitter.push(chunk)
+                    # total_bytes is the stream position at the end of this chunk;
+                    # pushes end on a frame boundary of the whole stream
+                    tail = total_bytes % self.FRAME_BYTES
+                    if not pending and not tail and len(chunk) >= self.PUSH_BYTES:
+                        output_emitter.push(chunk)
+                        continue
+                    pending += chunk
+                    if len(pending) >= self.PUSH_BYTES:
+                        aligned = len(pending) - tail
+                        output_emitter.push(bytes(memoryview(pending)[:aligned]))
+                        del pending[:aligned]  # keep the partial frame for the next push
+
+                if pending:
+                    output_emitter.push(bytes(pending))
+
+                if recorded is not None:
+                    self._tts._cache_audio(voice, text, bytes(recorded))
 
-            perf.tts_end = time.time()
+            perf.tts_end = time.perf_counter()
             total_time = int((perf.tts_end - start) * 1000)
-            logger.info(f"[TTS] Complete: {total_bytes} bytes in {total_time}ms")
+            logger.info("[TTS] Complete: %d bytes in %dms", total_bytes, total_time)
 
-            # Log full pipeline metrics
-            perf.log_summary("turn")
-            perf.reset()
+            # Log full pipeline metrics after the emitter is flushed, off the TTS path
+            asyncio.get_running_loop().call_soon(perf.end_turn, "turn")
 
         except asyncio.TimeoutError:
             logger.error("[TTS] Request timeout")
@@ -630,6 +988,91 @@ class PiperChunkedStream(tts.ChunkedStream):
         output_emitter.flush()
 
 
+# =============================================================================
+# Shared Models - loaded once per worker process, reused across rooms
+# =============================================================================
+
+_vad: Optional[silero.VAD] = None
+_llm: Optional[openai.LLM] = None
+_llm_key: Optional[tuple[str, str, Optional[str]]] = None
+
+
+def get_vad() -> silero.VAD:
+    """Get the process-wide Silero VAD, loading the ONNX model on first use."""
+    global _vad
+    if _vad is None:
+        # Per official LiveKit docs (docs.livekit.io/agents/build/turns/vad/)
+        # Increased min_silence_duration for multilingual (users pause longer between thoughts)
+        _vad = silero.VAD.load(
+            min_speech_duration=0.1,       # 100ms speech to start (prevents short noise triggers)
+            min_silence_duration=0.8,      # 800ms silence before end-of-turn (allows natural pauses)
+            activation_threshold=0.5,      # Default - balanced sensitivity
+            prefix_padding_duration=0.5,   # Default - 500ms context before speech
+        )
+        logger.info("[VAD] Silero VAD loaded")
+    return _vad
+
+
+# Fixed English opening line; synthesized by the first job in each worker
+# process and reused from JobProcess.userdata by later jobs
+GREETING_TEXT = "Hello! How can I help you today?"
+GREETING_VOICE = VOICE_MAP["en"]
+GREETING_TIMEOUT = aiohttp.ClientTimeout(total=2)
+
+
+async def _pcm_frames(pcm: bytes, sample_rate: int, frame_ms: int = 100):
+    """Yield mono int16 PCM as AudioFrames for session.say(audio=...)."""
+    step = sample_rate * frame_ms // 1000 * 2
+    for i in range(0, len(pcm), step):
+        chunk = pcm[i:i + step]
+        yield rtc.AudioFrame(
+            data=chunk,
+            sample_rate=sample_rate,
+            num_channels=1,
+            samples_per_channel=len(chunk) // 2,
+        )
+
+
+def prewarm(proc: JobProcess):
+    """Worker prewarm hook - load the VAD model before any job is assigned."""
+    proc.userdata["vad"] = get_vad()
+
+
+def get_llm(model: str, base_url: str, api_key: Optional[str] = None) -> openai.LLM:
+    """Get the process-wide LLM so its HTTP connection pool is shared.
+
+    Without an api_key the backend is Ollama; with one it is a generic
+    OpenAI-compatible server (vLLM, SGLang).
+    """
+    global _llm, _llm_key
+    key = (model, base_url, api_key)
+    if _llm is None or _llm_key != key:
+        if api_key is None:
+            _llm = openai.LLM.with_ollama(model=model, base_url=base_url)
+        else:
+            _llm = openai.LLM(model=model, base_url=base_url, api_key=api_key)
+        _llm_key = key
+    return _llm
+
+
+# Max time a job's shutdown waits for queued transcripts to be sent
+TRANSCRIPT_DRAIN_TIMEOUT = 2.0
+
+
+async def _transcript_publisher(queue: asyncio.Queue):
+    """Send queued transcripts one at a time, in order.
+
+    publish_transcript logs its own failures, so one bad publish never
+    stops the loop; task_done() lets shutdown wait for the queue to drain.
+    """
+    while True:
+        kwargs = await queue.get()
+        try:
+            await publish_transcript(**kwargs)
+        finally:
+            queue.task_done()
+
+
 # =============================================================================
 # Main Entry Point
 # =============================================================================
@@ -639,46 +1082,65 @@ async def entrypoint(ctx: JobContext):
 
     logger.info(f"Agent joining room: {ctx.room.name}")
 
+    # One keep-alive pool for this job's STT and TTS; closed with the job
+    http_session = create_http_session()
+    ctx.add_shutdown_callback(http_session.close)
+
     # Configuration from environment
     ollama_url = os.getenv("OLLAMA_URL", "http://192.168.1.120:11434")
     ollama_model = os.getenv("OLLAMA_MODEL", "llama3.1:8b")
+    # Optional OpenAI-compatible server with continuous batching (vLLM, SGLang);
+    # when unset the LLM is served by Ollama at OLLAMA_URL
+    llm_base_url = os.getenv("LLM_BASE_URL", "")
+    llm_model = os.getenv("LLM_MODEL") or ollama_model
     piper_url = os.getenv("PIPER_TTS_URL", "http://piper-tts:5500")
     wlk_host = os.getenv("WHISPERLIVEKIT_HOST", "192.168.1.120")
     wlk_port = int(os.getenv("WHISPERLIVEKIT_PORT", "8765"))
     wlk_ssl = os.getenv("WHISPERLIVEKIT_USE_SSL", "true").lower() == "true"
 
     logger.info(f"[CONFIG] STT: {'wss' if wlk_ssl else 'ws'}://{wlk_host}:{wlk_port}")
-    logger.info(f"[CONFIG] LLM: {ollama_url} ({ollama_model})")
+    if llm_base_url:
+        logger.info(f"[CONFIG] LLM: {llm_base_url} ({llm_model})")
+    else:
+        logger.info(f"[CONFIG] LLM: {ollama_url} ({ollama_model})")
     logger.info(f"[CONFIG] TTS: {piper_url}")
 
     # Create STT - WhisperLiveKit streaming with language detection
     my_stt = WhisperLiveKitSTT(
         host=wlk_host,
         port=wlk_port,
+        http_session=http_session,
         use_ssl=wlk_ssl
     )
 
     # Create TTS - Piper streaming with multi-language support
     # Pass STT instance so TTS can access detected language
-    my_tts = PiperTTS(base_url=piper_url, stt_instance=my_stt)
-
-    # Create LLM - Ollama via OpenAI-compatible API
-    # with_ollama() expects base URL WITH /v1 (e.g., http://host:11434/v1)
-    ollama_base_url = f"{ollama_url.rstrip('/')}/v1"
-    my_llm = openai.LLM.with_ollama(
-        model=ollama_model,
-        base_url=ollama_base_url
-    )
-    logger.info(f"[CONFIG] LLM base URL: {ollama_base_url}")
-
-    # Create VAD - per official LiveKit docs (docs.livekit.io/agents/build/turns/vad/)
-    # Increased min_silence_duration for multilingual (users pause longer between thoughts)
-    my_vad = silero.VAD.load(
-        min_speech_duration=0.1,       # 100ms speech to start (prevents short noise triggers)
-        min_silence_duration=0.8,      # 800ms silence before end-of-turn (allows natural pauses)
-        activation_threshold=0.5,      # Default - balanced sensitivity
-        prefix_padding_duration=0.5,   # Default - 500ms context before speech
-    )
+    my_tts = PiperTTS(base_url=piper_url, http_session=http_session, stt_instance=my_stt)
+
+    # Establish STT/TTS connections before the participant starts talking.
+    # The STT websocket opens in the background and is handed to the first
+    # stream; an unclaimed one is closed with the job. The Piper warm-up
+    # also runs in the background and is awaited together with session.start()
+    my_stt.prewarm()
+    ctx.add_shutdown_callback(my_stt.close_prewarmed)
+    tts_prewarm = asyncio.ensure_future(my_tts.prewarm())
+
+    if llm_base_url:
+        # Create LLM - OpenAI-compatible server, base URL WITH /v1 (e.g., http://vllm:8000/v1)
+        my_llm = get_llm(
+            model=llm_model,
+            base_url=llm_base_url,
+            api_key=os.getenv("LLM_API_KEY", "EMPTY"),
+        )
+    else:
+        # Create LLM - Ollama via OpenAI-compatible API
+        # with_ollama() expects base URL WITH /v1 (e.g., http://host:11434/v1)
+        ollama_base_url = f"{ollama_url.rstrip('/')}/v1"
+        my_llm = get_llm(model=ollama_model, base_url=ollama_base_url)
+        logger.info(f"[CONFIG] LLM base URL: {ollama_base_url}")
+
+    # VAD is loaded once per worker process and shared across rooms
+    my_vad = ctx.proc.userdata.get("vad") or get_vad()
 
     # Create agent with voice-optimized instructions ONLY
     # Per official example: LLM goes in AgentSession, NOT Agent!
@@ -717,64 +1179,123 @@ For medical, legal, or financial topics, suggest consulting a professional.""",
         allow_interruptions=True,
         min_endpointing_delay=0.5,         # Official default: 500ms minimum before responding
         max_endpointing_delay=6.0,         # Official default: 6s max wait (NOT 3s)
+        preemptive_generation=True,        # Start LLM on the STT final while end-of-turn is still pending
     )
     logger.info("[FLOW] AgentSession created")
 
+    # Identity of the (first) remote user, kept current by room events so the
+    # transcript handlers don't scan remote_participants on every event
+    remote_identity = "user"
+
+    def _refresh_remote_identity(exclude: Optional[str] = None):
+        nonlocal remote_identity
+        remote_identity = next(
+            (p.identity for p in ctx.room.remote_participants.values() if p.identity != exclude),
+            "user",
+        )
+
+    @ctx.room.on("participant_connected")
+    def on_participant_connected(participant: rtc.RemoteParticipant):
+        nonlocal remote_identity
+        if remote_identity == "user":
+            remote_identity = participant.identity
+
+    @ctx.room.on("participant_disconnected")
+    def on_participant_disconnected(participant: rtc.RemoteParticipant):
+        if participant.identity == remote_identity:
+            _refresh_remote_identity(exclude=participant.identity)
+
+    # Transcripts go through one queue drained by a single task: ordered
+    # delivery, no task per event, and nothing dropped. State updates stay
+    # fire-and-forget on the lossy channel so they never wait behind them.
+    transcript_q: asyncio.Queue = asyncio.Queue()
+    publisher_task = asyncio.create_task(_transcript_publisher(transcript_q))
+
+    async def _drain_transcripts():
+        try:
+            await asyncio.wait_for(transcript_q.join(), timeout=TRANSCRIPT_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("[PUBLISH] %d transcripts unsent at shutdown", transcript_q.qsize())
+        publisher_task.cancel()
+
+    ctx.add_shutdown_callback(_drain_transcripts)
+
+    # Fire-and-forget state publishes; the set holds a reference to each
+    # in-flight task so the event loop cannot garbage-collect it mid-send
+    state_tasks: set[asyncio.Task] = set()
+
+    def publish_state_bg(topic: str, state: str):
+        task = asyncio.create_task(
+            publish_state(ctx.room.local_participant, topic=topic, state=state)
+        )
+        state_tasks.add(task)
+        task.add_done_callback(state_tasks.discard)
+
     # Register event handlers for metrics and transcript publishing
     # IMPORTANT: Must register BEFORE session.start()
     @session.on("agent_state_changed")
     def on_agent_state(ev):
         """Track agent state for latency measurement."""
         if ev.new_state == "speaking":
-            perf.llm_start = time.time()
-        logger.info(f"[EVENT] Agent state: {ev.old_state} -> {ev.new_state}")
+            perf.llm_start = time.perf_counter()
+        logger.info("[EVENT] Agent state: %s -> %s", ev.old_state, ev.new_state)
+        publish_state_bg("agent_status", ev.new_state)
+
+    @session.on("user_state_changed")
+    def on_user_state(ev):
+        """Forward user speaking/listening state to the frontend."""
+        logger.debug("[EVENT] User state: %s -> %s", ev.old_state, ev.new_state)
+        publish_state_bg("user_status", ev.new_state)
 
     @session.on("user_input_transcribed")
     def on_user_input_transcribed(ev):
-        """Handle user input transcription - alternative to conversation_item_added."""
-        logger.info(f"[EVENT] User transcribed: '{ev.transcript}' (final={ev.is_final})")
+        """Handle user input transcription - sole source of user transcripts."""
+        logger.info("[EVENT] User transcribed: %r (final=%s)", ev.transcript, ev.is_final)
         if ev.is_final:
-            asyncio.create_task(publish_transcript(
-                ctx.room.local_participant,
+            transcript_q.put_nowait(dict(
+                local_participant=ctx.room.local_participant,
                 speaker="user",
                 text=ev.transcript,
-                participant_identity=ctx.room.remote_participants.get(list(ctx.room.remote_participants.keys())[0]).identity if ctx.room.remote_participants else "user"
+                participant_identity=remote_identity,
             ))
 
     @session.on("conversation_item_added")
     def on_conversation_item(ev):
-        """Handle new conversation items - publish transcripts."""
+        """Handle new conversation items - publish assistant transcripts.
+
+        User text is already published by on_user_input_transcribed.
+        """
         item = ev.item
-        role = getattr(item, 'role', '')
-        text = getattr(item, 'text_content', '') or ''
+        if getattr(item, 'role', '') != "assistant":
+            return
 
+        text = getattr(item, 'text_content', '') or ''
         if not text:
             return
 
-        display = f"'{text[:50]}...'" if len(text) > 50 else f"'{text}'"
-
-        if role == "assistant":
-            logger.info(f"[EVENT] Agent said: {display}")
-            asyncio.create_task(publish_transcript(
-                ctx.room.local_participant,
-                speaker="assistant",
-                text=text,
-                participant_identity="Voice Assistant"
-            ))
-        elif role == "user":
-            logger.info(f"[EVENT] User said: {display}")
-            asyncio.create_task(publish_transcript(
-                ctx.room.local_participant,
-                speaker="user",
-                text=text,
-                participant_identity=ctx.room.remote_participants.get(list(ctx.room.remote_participants.keys())[0]).identity if ctx.room.remote_participants else "user"
-            ))
+        logger.info("[EVENT] Agent said: %r", text[:50])
+        transcript_q.put_nowait(dict(
+            local_participant=ctx.room.local_participant,
+            speaker="assistant",
+            text=text,
+            participant_identity="Voice Assistant",
+        ))
 
     # Start the session BEFORE connecting to room (per official example)
     # This allows session to properly initialize audio pipeline
     logger.info("[FLOW] Starting session...")
     try:
-        await session.start(agent=agent, room=ctx.room)
+        await asyncio.gather(
+            session.start(
+                agent=agent,
+                room=ctx.room,
+                # Subscribe at WhisperLiveKit's native 16kHz mono (default is 24kHz):
+                # the native AudioStream resamples once and the STT stream's own
+                # resampler to 16kHz becomes a no-op
+                room_input_options=RoomInputOptions(audio_sample_rate=16000, audio_num_channels=1),
+            ),
+            tts_prewarm,
+        )
         logger.info("[FLOW] Session started successfully")
     except Exception as e:
         logger.error(f"[FLOW] Session start failed: {e}")
@@ -782,24 +1303,47 @@ For medical, legal, or financial topics, suggest consulting a professional.""",
         traceback.print_exc()
         raise
 
+    # Fetch the greeting audio while connecting, skipping the LLM round trip;
+    # later jobs in this process reuse the first job's PCM
+    greeting_pcm = ctx.proc.userdata.get("greeting_pcm")
+    greeting_audio = None
+    if greeting_pcm is None:
+        greeting_audio = asyncio.ensure_future(
+            my_tts.synthesize_pcm(GREETING_TEXT, GREETING_VOICE, GREETING_TIMEOUT)
+        )
+
     # Connect to room AFTER session is started (per official example)
     logger.info("[FLOW] Connecting to room...")
     await ctx.connect(auto_subscribe=AutoSubscribe.SUBSCRIBE_ALL)
     logger.info("[FLOW] Connected to room")
 
+    # Participants already in the room never fire participant_connected
+    _refresh_remote_identity()
+
     # List current participants for debugging
     logger.info(f"[FLOW] Room participants: {len(ctx.room.remote_participants)}")
     for sid, p in ctx.room.remote_participants.items():
         logger.info(f"[FLOW]   - {p.identity} (sid={sid}, kind={p.kind})")
 
-    # Generate greeting in English
+    # Greet in English - play the synthesized audio when available,
+    # otherwise fall back to an LLM-generated greeting
     logger.info("[FLOW] Generating initial greeting...")
-    greeting_start = time.time()
+    greeting_start = time.perf_counter()
+    if greeting_audio is not None:
+        greeting_pcm = await greeting_audio
+        if greeting_pcm:
+            ctx.proc.userdata["greeting_pcm"] = greeting_pcm
     try:
-        await session.generate_reply(
-            instructions="Say a brief friendly greeting like 'Hello! How can I help you today?' Keep it short."
-        )
-        logger.info(f"[FLOW] Greeting generated in {(time.time()-greeting_start)*1000:.0f}ms")
+        if greeting_pcm:
+            await session.say(
+                GREETING_TEXT,
+                audio=_pcm_frames(greeting_pcm, my_tts.sample_rate),
+            )
+        else:
+            await session.generate_reply(
+                instructions=f"Say a brief friendly greeting like '{GREETING_TEXT}' Keep it short."
+            )
+        logger.info(f"[FLOW] Greeting generated in {(time.perf_counter()-greeting_start)*1000:.0f}ms")
     except Exception as e:
         logger.error(f"[FLOW] Greeting generation failed: {e}")
 
@@ -822,15 +1366,14 @@ async def publish_transcript(
 ):
     """Publish transcript to frontend via data channel."""
     try:
-        import datetime
-        payload = json.dumps({
+        payload = orjson.dumps({
             "type": "transcript",
             "speaker": speaker,
             "text": text,
             "participantIdentity": participant_identity,
-            "timestamp": datetime.datetime.utcnow().isoformat(),
+            "timestamp": datetime.datetime.now(_UTC).isoformat(timespec="milliseconds"),
             "detectedLanguage": detected_language,
-        }).encode("utf-8")
+        })
 
         await local_participant.publish_data(
             payload=payload,
@@ -841,6 +1384,29 @@ async def publish_transcript(
         logger.error(f"Failed to publish transcript: {e}")
 
 
+async def publish_state(
+    local_participant: rtc.LocalParticipant,
+    topic: str,
+    state: str,
+):
+    """Publish agent/user state to frontend via the lossy data channel.
+
+    State updates are ephemeral (the next transition supersedes them), so they
+    go over the unreliable channel to avoid head-of-line blocking behind
+    transcripts. Transcripts stay on the reliable channel.
+    """
+    try:
+        payload = orjson.dumps({"state": state})
+
+        await local_participant.publish_data(
+            payload=payload,
+            topic=topic,
+            reliable=False,
+        )
+    except Exception as e:
+        logger.debug("Failed to publish %s: %s", topic, e)
+
+
 async def request_fnc(request):
     """Handle incoming job requests - accept one agent per room."""
     logger.info(f"[REQUEST] Job request for room: {request.room.name}")
@@ -852,4 +1418,5 @@ if __name__ == "__main__":
     cli.run_app(WorkerOptions(
         entrypoint_fnc=entrypoint,
         request_fnc=request_fnc,
+        prewarm_fnc=prewarm,
     ))
@@ -450,5 +450,8 @@ if __name__ == "__main__":
         app,
         host="0.0.0.0",
         port=5500,
-        log_level="info"
+        log_level="info",
+        # Outlive the agent's 60s client keep-alive so pooled connections are
+        # reused between turns instead of reconnecting (uvicorn default is 5s)
+        timeout_keep_alive=75,
     )